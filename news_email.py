@@ -1,9 +1,14 @@
 import feedparser
+import hashlib
+import html
+import json
+import re
+import requests
 import smtplib
 import os
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from newspaper import Article
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+from requests.adapters import HTTPAdapter
 
 RSS_FEEDS=[
 "https://feeds.reuters.com/reuters/worldNews",
@@ -11,60 +16,273 @@ RSS_FEEDS=[
 "https://www.economist.com/international/rss.xml"
 ]
 
+MAX_STORIES=5
+
 EMAIL_ADDRESS=os.getenv("EMAIL_USER")
 EMAIL_PASSWORD=os.getenv("EMAIL_PASS")
 
-def get_long_summary(url):
+HTTP_TIMEOUT=10
+
+# one pooled session for feeds and articles, so same-host requests reuse sockets
+SESSION=requests.Session()
+SESSION.mount("https://",HTTPAdapter(pool_connections=10,pool_maxsize=20))
+SESSION.mount("http://",HTTPAdapter(pool_connections=10,pool_maxsize=20))
+SESSION.headers["User-Agent"]="news-bot/1.0"
+
+# feed bodies plus their ETag/Last-Modified, kept between runs for conditional GETs
+FEED_CACHE_DIR=".feed_cache"
+FEED_CACHE_INDEX=os.path.join(FEED_CACHE_DIR,"index.json")
+
+SUMMARY_MAX_LENGTH=1500
+MIN_FEED_SUMMARY_LENGTH=300
+
+TAG_RE=re.compile(r"<[^>]+>")
+WHITESPACE_RE=re.compile(r"\s+")
+
+def http_get(url,headers=None):
+    response=SESSION.get(url,headers=headers,timeout=HTTP_TIMEOUT)
+    response.raise_for_status()
+    return response
+
+def strip_html(raw_text):
+    text=html.unescape(TAG_RE.sub(" ",raw_text))
+    return WHITESPACE_RE.sub(" ",text).strip()
+
+def get_article_body(url):
+    # newspaper pulls in lxml, nltk and PIL, so only import it when an article is actually needed
+    from newspaper import Article
     try:
         article=Article(url)
-        article.download()
+        # hand newspaper the raw bytes so it can honour a charset declared only in <meta>
+        article.set_html(http_get(url).content)
         article.parse()
-        article.nlp()
-        text=article.text
-        summary=article.summary
-        if len(summary)<500:
-            summary=summary+"\n\n"+text[:1000]
-        return summary[:1500]
+        return article.text[:SUMMARY_MAX_LENGTH]
     except:
-        return "Full text not available."
+        return ""
+
+def get_long_summary(item):
+    # the feed's own abstract is usually enough; only download the article when it is too short
+    summary=strip_html(item.get("summary",""))
+    if len(summary)<MIN_FEED_SUMMARY_LENGTH:
+        # a paywall stub must not replace a real editor abstract, so keep the longer text
+        body=get_article_body(item.link)
+        if len(body)>len(summary):
+            summary=body
+    return summary[:SUMMARY_MAX_LENGTH] or "Full text not available."
+
+# words that carry no story identity and are ignored when comparing titles
+TITLE_STOPWORDS=frozenset([
+"a","an","and","as","at","by","for","from","in","is","of","on","or","the","to","with"
+])
+
+WORD_RE=re.compile(r"\w+")
+
+def title_words(title):
+    return frozenset(WORD_RE.findall(title.lower()))-TITLE_STOPWORDS
+
+def is_same_story(words,other):
+    # a prefix like "BREAKING:" only adds words, while a different story swaps at least one out
+    if not words or not other:
+        return False
+    return words<=other or other<=words
+
+def dedupe_entries(entries,limit):
+    unique=[]
+    seen=[]
+    for entry in entries:
+        if len(unique)>=limit:
+            break
+        words=title_words(entry.get("title",""))
+        if any(is_same_story(words,other) for other in seen):
+            continue
+        seen.append(words)
+        unique.append(entry)
+    return unique
+
+def load_feed_cache():
+    try:
+        with open(FEED_CACHE_INDEX) as f:
+            return json.load(f)
+    except (OSError,ValueError):
+        return {}
+
+def save_feed_cache(cache):
+    # write to a temp file and swap it in, so a crash mid-write cannot truncate the index
+    tmp_path=FEED_CACHE_INDEX+".tmp"
+    try:
+        with open(tmp_path,"w") as f:
+            json.dump(cache,f,indent=2)
+        os.replace(tmp_path,FEED_CACHE_INDEX)
+    except OSError:
+        pass
+
+def feed_cache_path(url):
+    return os.path.join(FEED_CACHE_DIR,hashlib.sha1(url.encode()).hexdigest()+".xml")
+
+def read_cached_feed(path):
+    try:
+        with open(path,"rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def write_cached_feed(path,content):
+    try:
+        with open(path,"wb") as f:
+            f.write(content)
+        return True
+    except OSError:
+        return False
+
+def fetch_feed(url,cache):
+    path=feed_cache_path(url)
+    # the cache is only an optimisation: if the stored body cannot be read, fetch unconditionally
+    cached_content=read_cached_feed(path) if url in cache else None
+    headers={}
+    if cached_content is not None:
+        if cache[url].get("etag"):
+            headers["If-None-Match"]=cache[url]["etag"]
+        if cache[url].get("modified"):
+            headers["If-Modified-Since"]=cache[url]["modified"]
+    try:
+        response=http_get(url,headers)
+    except requests.RequestException:
+        return []
+    if response.status_code==304 and cached_content is not None:
+        content=cached_content
+        content_type=cache[url].get("content_type","")
+    else:
+        content=response.content
+        content_type=response.headers.get("Content-Type","")
+        if write_cached_feed(path,content):
+            cache[url]={
+                "etag":response.headers.get("ETag"),
+                "modified":response.headers.get("Last-Modified"),
+                "content_type":content_type
+            }
+        else:
+            cache.pop(url,None)
+    # keep the HTTP context feedparser.parse(url) had: header charset and the base for relative links
+    response_headers={"content-location":response.url,"content-type":content_type}
+    return feedparser.parse(content,response_headers=response_headers).entries
 
 def fetch_news():
+    try:
+        os.makedirs(FEED_CACHE_DIR,exist_ok=True)
+    except OSError:
+        pass
+    cache=load_feed_cache()
     all_entries=[]
-    for feed in RSS_FEEDS:
-        parsed=feedparser.parse(feed)
-        all_entries.extend(parsed.entries[:5])
-    return all_entries[:5]
+    # executor.map keeps RSS_FEEDS order, so feed priority is unchanged
+    with ThreadPoolExecutor(max_workers=len(RSS_FEEDS)) as executor:
+        for entries in executor.map(lambda url:fetch_feed(url,cache),RSS_FEEDS):
+            all_entries.extend(entries[:MAX_STORIES])
+    save_feed_cache(cache)
+    return dedupe_entries(all_entries,MAX_STORIES)
 
-def build_email():
+EMAIL_HEADING="🌍 Daily Global News Briefing"
+
+TEXT_TEMPLATE="{heading}\n\n{stories}"
+TEXT_STORY_TEMPLATE="{number}. {title}\n\n{summary}\n\nRead more: {link}\n\n"
+
+HTML_TEMPLATE="""<html>
+<body>
+<h2>{heading}</h2>
+{stories}</body>
+</html>
+"""
+HTML_STORY_TEMPLATE="""<h3>{number}. {title}</h3>
+<p style="white-space:pre-line">{summary}</p>
+<p><a href="{link}">Read more</a></p>
+"""
+
+def collect_stories():
     news_list=fetch_news()
-    body="🌍 Daily Global News Briefing\n\n"
-    for i,item in enumerate(news_list,1):
-        title=item.title
-        link=item.link
-        summary=get_long_summary(link)
-        body+=f"{i}. {title}\n\n{summary}\n\nRead more: {link}\n\n"
-    return body
-
-def send_email(content):
-    if not EMAIL_ADDRESS or not EMAIL_PASSWORD:
-        raise ValueError("Missing email credentials")
-
-    msg=MIMEMultipart()
+    with ThreadPoolExecutor(max_workers=max(len(news_list),1)) as executor:
+        summaries=list(executor.map(get_long_summary,news_list))
+    return [
+        {"number":i,"title":item.title,"summary":summary,"link":item.link}
+        for i,(item,summary) in enumerate(zip(news_list,summaries),1)
+    ]
+
+def render_text(stories):
+    items="".join(TEXT_STORY_TEMPLATE.format_map(story) for story in stories)
+    return TEXT_TEMPLATE.format(heading=EMAIL_HEADING,stories=items)
+
+def render_html(stories):
+    items="".join(
+        HTML_STORY_TEMPLATE.format_map({key:html.escape(str(value)) for key,value in story.items()})
+        for story in stories
+    )
+    return HTML_TEMPLATE.format(heading=html.escape(EMAIL_HEADING),stories=items)
+
+def build_email():
+    stories=collect_stories()
+    return render_text(stories),render_html(stories)
+
+SMTP_HOST="smtp.gmail.com"
+SMTP_PORT=587
+
+class SMTPSender:
+    # keeps one authenticated connection open so several messages share a single TLS+AUTH handshake
+    def __init__(self):
+        self.smtp=None
+
+    def connect(self):
+        if not EMAIL_ADDRESS or not EMAIL_PASSWORD:
+            raise ValueError("Missing email credentials")
+        self.close()
+        self.smtp=smtplib.SMTP(SMTP_HOST,SMTP_PORT)
+        self.smtp.starttls()
+        self.smtp.login(EMAIL_ADDRESS,EMAIL_PASSWORD)
+
+    def is_alive(self):
+        # an idle timeout may already be buffered as a 421 reply rather than a closed socket
+        try:
+            return self.smtp.noop()[0]==250
+        except smtplib.SMTPServerDisconnected:
+            return False
+
+    def send(self,msg):
+        if self.smtp is None or not self.is_alive():
+            self.connect()
+        self.smtp.send_message(msg)
+
+    def close(self):
+        if self.smtp is None:
+            return
+        try:
+            self.smtp.quit()
+        except (smtplib.SMTPException,OSError):
+            self.smtp.close()
+        self.smtp=None
+
+    # connecting is left to the caller (or the first send) so it can overlap with other work
+    def __enter__(self):
+        return self
+
+    def __exit__(self,*exc):
+        self.close()
+
+def build_message(text_body,html_body):
+    msg=EmailMessage()
     msg["From"]=EMAIL_ADDRESS
     msg["To"]=EMAIL_ADDRESS
     msg["Subject"]="Daily Global News"
 
-    msg.attach(MIMEText(content,"plain"))
-
-    with smtplib.SMTP("smtp.gmail.com",587) as server:
-        server.starttls()
-        server.login(EMAIL_ADDRESS,EMAIL_PASSWORD)
-        server.send_message(msg)
+    msg.set_content(text_body)
+    msg.add_alternative(html_body,subtype="html")
+    return msg
 
 def main():
     print("📡 Daily News Bot starting…")
-    email_body=build_email()
-    send_email(email_body)
+    with SMTPSender() as sender:
+        # log in to SMTP while the feeds and articles are downloading
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            connecting=executor.submit(sender.connect)
+            text_body,html_body=build_email()
+        connecting.result()
+        sender.send(build_message(text_body,html_body))
     print("✅ Email sent successfully!")
 
 if __name__=="__main__":
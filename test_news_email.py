@@ -0,0 +1,137 @@
+import news_email
+
+def titles(*items):
+    return [{"title":title} for title in items]
+
+def kept(entries,limit=10):
+    return [entry["title"] for entry in news_email.dedupe_entries(entries,limit)]
+
+def test_prefixed_title_is_a_duplicate():
+    entries=titles(
+        "BREAKING: Earthquake strikes off the coast of Japan, tsunami warning issued",
+        "Earthquake strikes off coast of Japan, tsunami warning issued",
+        "Ukraine war: Russia and Ukraine agree to ceasefire",
+        "Russia and Ukraine agree ceasefire",
+        "Ukraine war: Kyiv hit by drones",
+        "Kyiv hit by drones"
+    )
+    assert kept(entries)==[
+        "BREAKING: Earthquake strikes off the coast of Japan, tsunami warning issued",
+        "Ukraine war: Russia and Ukraine agree to ceasefire",
+        "Ukraine war: Kyiv hit by drones"
+    ]
+
+def test_one_word_swap_is_a_different_story():
+    entries=titles(
+        "Biden to meet Xi",
+        "Biden to meet Putin",
+        "China to hold talks with US",
+        "China to hold talks with EU",
+        "Russia and Ukraine agree ceasefire",
+        "Israel and Hamas agree ceasefire"
+    )
+    assert kept(entries)==[entry["title"] for entry in entries]
+
+def test_dedupe_stops_at_limit():
+    entries=titles("Biden to meet Xi","Biden to meet Putin","Storm hits coast of Japan")
+    assert kept(entries,limit=2)==["Biden to meet Xi","Biden to meet Putin"]
+
+class FakeSMTP:
+    instances=[]
+
+    def __init__(self,host,port):
+        self.noop_code=250
+        self.sent=[]
+        self.closed=False
+        FakeSMTP.instances.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self,user,password):
+        pass
+
+    def noop(self):
+        return (self.noop_code,b"")
+
+    def send_message(self,msg):
+        self.sent.append(msg)
+
+    def quit(self):
+        self.closed=True
+
+def test_sender_reconnects_after_idle_timeout_reply(monkeypatch):
+    FakeSMTP.instances=[]
+    monkeypatch.setattr(news_email.smtplib,"SMTP",FakeSMTP)
+    monkeypatch.setattr(news_email,"EMAIL_ADDRESS","bot@example.com")
+    monkeypatch.setattr(news_email,"EMAIL_PASSWORD","secret")
+    with news_email.SMTPSender() as sender:
+        sender.connect()
+        FakeSMTP.instances[0].noop_code=421
+        sender.send("message")
+    stale,fresh=FakeSMTP.instances
+    assert stale.closed and stale.sent==[]
+    assert fresh.closed and fresh.sent==["message"]
+
+FEED_URL="https://news.example.com/world/rss.xml"
+FEED_BODY=(
+    "<?xml version='1.0'?><rss version='2.0'><channel><title>World</title>"
+    "<item><title>Новости мира</title><link>/world/cafe</link></item>"
+    "</channel></rss>"
+).encode("koi8-r")
+
+class FakeResponse:
+    def __init__(self,status_code,content=b"",headers=None):
+        self.status_code=status_code
+        self.content=content
+        self.headers=headers or {}
+        self.url=FEED_URL
+
+def test_fetch_feed_keeps_http_context_on_fresh_and_cached_reads(monkeypatch,tmp_path):
+    monkeypatch.setattr(news_email,"FEED_CACHE_DIR",str(tmp_path))
+    responses=[
+        FakeResponse(200,FEED_BODY,{"Content-Type":"application/rss+xml; charset=koi8-r","ETag":'"v1"'}),
+        FakeResponse(304)
+    ]
+    requested=[]
+    def fake_get(url,headers=None):
+        requested.append(headers)
+        return responses.pop(0)
+    monkeypatch.setattr(news_email,"http_get",fake_get)
+    cache={}
+    for _ in range(2):
+        entries=news_email.fetch_feed(FEED_URL,cache)
+        assert entries[0].title=="Новости мира"
+        assert entries[0].link=="https://news.example.com/world/cafe"
+    assert requested[1]["If-None-Match"]=='"v1"'
+
+class FakeEntry(dict):
+    link="https://news.example.com/story"
+
+def test_long_summary_keeps_feed_abstract_over_shorter_article_text(monkeypatch):
+    abstract="An editor-written abstract. "*8
+    monkeypatch.setattr(news_email,"get_article_body",lambda url:"Subscribe to read")
+    assert news_email.get_long_summary(FakeEntry(summary=abstract))==abstract.strip()
+    monkeypatch.setattr(news_email,"get_article_body",lambda url:"Full article text. "*40)
+    assert news_email.get_long_summary(FakeEntry(summary=abstract)).startswith("Full article text.")
+
+def test_fetch_feed_refetches_when_cached_body_is_missing(monkeypatch,tmp_path):
+    monkeypatch.setattr(news_email,"FEED_CACHE_DIR",str(tmp_path))
+    requested=[]
+    def fake_get(url,headers=None):
+        requested.append(headers)
+        return FakeResponse(200,FEED_BODY,{"Content-Type":"application/rss+xml; charset=koi8-r"})
+    monkeypatch.setattr(news_email,"http_get",fake_get)
+    cache={FEED_URL:{"etag":'"v1"',"modified":None,"content_type":""}}
+    assert news_email.fetch_feed(FEED_URL,cache)[0].title=="Новости мира"
+    assert requested==[{}]
+
+def test_unwritable_feed_cache_does_not_stop_the_run(monkeypatch,tmp_path):
+    blocker=tmp_path/"not-a-dir"
+    blocker.write_text("")
+    cache_dir=str(blocker/"cache")
+    monkeypatch.setattr(news_email,"FEED_CACHE_DIR",cache_dir)
+    monkeypatch.setattr(news_email,"FEED_CACHE_INDEX",cache_dir+"/index.json")
+    monkeypatch.setattr(news_email,"RSS_FEEDS",[FEED_URL])
+    monkeypatch.setattr(news_email,"http_get",lambda url,headers=None:FakeResponse(200,FEED_BODY))
+    assert len(news_email.fetch_news())==1